@@ -1,4 +1,5 @@
 import hashlib
+import io
 import traceback
 import threading
 import time
@@ -9,41 +10,64 @@ from rotation_tool.io_utils import load_csv, export_csv
 from rotation_tool.visuals import render_team_panel, render_oncourt_chart
 from rotation_tool.data_model import GameData
 
+# Static page chrome, built once at import rather than on every rerun
+STYLE_HTML = """
+<style>
+:root{ --toolbar-top-margin:28px; --page-top-padding:1.2rem; }
+.block-container { padding-top: var(--page-top-padding); padding-bottom: .5rem; }
+div[data-testid="stVerticalBlock"] > div:has(> div[data-testid="column"]) { margin-bottom: .18rem; }
+div[data-baseweb="select"] > div { min-height: 30px; }
+input[type="number"], input[type="text"] { height: 30px; padding-top: 2px; padding-bottom: 2px; }
+.toolbar-spacer { height: var(--toolbar-top-margin); }
+hr { margin:4px 0; border:0; height:1px; background:#eee; }
+</style>
+"""
+TOOLBAR_SPACER_HTML = '<div class="toolbar-spacer"></div>'
+
 
 # ---- Auto-exit when no sessions are open ----
-def _auto_exit_when_no_sessions(grace_seconds: int = 5, poll_interval: float = 0.5):
+def _auto_exit_when_no_sessions(
+    grace_seconds: int = 5,
+    poll_interval: float = 0.1,
+    busy_poll_interval: float = 2.0,
+):
     """
     Exit the process automatically when Streamlit has zero active sessions
     for `grace_seconds`. Uses private runtime API; pin Streamlit version.
+    Polls slowly while sessions are open and quickly once they drop to zero.
     """
     if "_auto_exit_started" in st.session_state:
         return
     st.session_state["_auto_exit_started"] = True
 
     def _watcher():
-        try:
-            from streamlit.runtime import get_instance
+        while True:
+            try:
+                from streamlit.runtime import get_instance
 
-            rt = get_instance()
-        except Exception:
-            time.sleep(1.0)
-            return _watcher()
+                rt = get_instance()
+                break
+            except Exception:
+                time.sleep(1.0)
 
         stable_zero_since = None
+        interval = poll_interval
         while True:
             try:
                 active = len(rt._session_mgr.list_active_sessions())
                 now = time.time()
                 if active == 0:
+                    interval = poll_interval
                     if stable_zero_since is None:
                         stable_zero_since = now
                     elif now - stable_zero_since >= grace_seconds:
                         os._exit(0)
                 else:
+                    interval = busy_poll_interval
                     stable_zero_since = None
             except Exception:
                 stable_zero_since = None
-            time.sleep(poll_interval)
+            time.sleep(interval)
 
     threading.Thread(target=_watcher, daemon=True).start()
 
@@ -60,41 +84,33 @@ def _hash_uploaded_file(file):
             file.seek(0)
         except Exception:
             pass
-    return hashlib.md5(raw).hexdigest()
+    # Change detection only (not security), so a short BLAKE2b digest is plenty
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+@st.cache_data(show_spinner=False)
+def _load_csv_cached(raw_bytes: bytes) -> GameData:
+    """Parse an upload once per distinct content; callers get their own copy to edit."""
+    return load_csv(io.BytesIO(raw_bytes))
 
 
 def main():
     st.set_page_config(page_title="NBA Rotation Tool", layout="wide")
     _auto_exit_when_no_sessions(grace_seconds=5)
 
-    # Compact CSS
-    st.markdown(
-        """
-        <style>
-        :root{ --toolbar-top-margin:28px; --page-top-padding:1.2rem; }
-        .block-container { padding-top: var(--page-top-padding); padding-bottom: .5rem; }
-        div[data-testid="stVerticalBlock"] > div:has(> div[data-testid="column"]) { margin-bottom: .18rem; }
-        div[data-baseweb="select"] > div { min-height: 30px; }
-        input[type="number"], input[type="text"] { height: 30px; padding-top: 2px; padding-bottom: 2px; }
-        .toolbar-spacer { height: var(--toolbar-top-margin); }
-        hr { margin:4px 0; border:0; height:1px; background:#eee; }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    # Compact CSS (must be re-emitted every rerun; Streamlit drops elements that aren't)
+    st.markdown(STYLE_HTML, unsafe_allow_html=True)
 
     # ---- Session state init ----
     if "game" not in st.session_state:
         st.session_state.game = GameData()
     if "uploaded_hash" not in st.session_state:
         st.session_state.uploaded_hash = None
-    if "render_nonce" not in st.session_state:
-        st.session_state.render_nonce = 0
     if "export_filename" not in st.session_state:
         st.session_state.export_filename = "PlayerOverrides.csv"
 
     # Toolbar spacer
-    st.markdown('<div class="toolbar-spacer"></div>', unsafe_allow_html=True)
+    st.markdown(TOOLBAR_SPACER_HTML, unsafe_allow_html=True)
 
     # --------------------------
     # Row 1: IMPORT / REFRESH / EXPORT
@@ -111,32 +127,35 @@ def main():
                 base = name.rsplit(".", 1)[0] if "." in name else name
                 st.session_state.export_filename = f"{base}.csv"
 
-                new_hash = _hash_uploaded_file(uploaded)
+                # Same upload as last rerun → reuse its hash instead of re-reading the bytes
+                upload_id = getattr(uploaded, "file_id", None) or id(uploaded)
+                if (
+                    upload_id == st.session_state.get("_last_upload_id")
+                    and uploaded.size == st.session_state.get("_last_upload_size")
+                ):
+                    new_hash = st.session_state.get("_last_upload_hash")
+                else:
+                    new_hash = _hash_uploaded_file(uploaded)
+                    st.session_state["_last_upload_id"] = upload_id
+                    st.session_state["_last_upload_size"] = uploaded.size
+                    st.session_state["_last_upload_hash"] = new_hash
                 if new_hash and new_hash != st.session_state.get("uploaded_hash"):
-                    try:
-                        uploaded.seek(0)
-                    except Exception:
-                        pass
-                    st.session_state.game = load_csv(uploaded)
+                    st.session_state.game = _load_csv_cached(uploaded.getvalue())
                     st.session_state.uploaded_hash = new_hash
-                    st.session_state.render_nonce = (
-                        st.session_state.get("render_nonce", 0) + 1
-                    )
             except Exception as ex:
                 st.error("Failed to load CSV.")
                 st.exception(ex)
 
     with col_refresh:
         st.markdown("<div style='height:30px'></div>", unsafe_allow_html=True)
-        if st.button("🔄 Refresh view", width="stretch"):
-            st.session_state.render_nonce += 1
+        # Clicking reruns the app; charts are keyed on content, so nothing else to bump
+        st.button("🔄 Refresh view", width="stretch")
 
     with col_export:
         st.markdown("<div style='height:30px'></div>", unsafe_allow_html=True)
-        df_for_download = export_csv(st.session_state.game)
         st.download_button(
             "⬇️ Download CSV",
-            data=df_for_download.to_csv(index=False).encode("utf-8"),
+            data=export_csv(st.session_state.game),
             file_name=st.session_state.get("export_filename", "PlayerOverrides.csv"),
             mime="text/csv",
             width="stretch",
@@ -2,13 +2,13 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Stint:
     start_min: float
     end_min: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     player_id: str
     name: str
@@ -27,13 +27,13 @@ class Player:
     stints: List[Stint] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Team:
     name: str
     players: List[Player] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class GameData:
     home_team: Team = field(default_factory=lambda: Team(name="HomeTeam"))
     away_team: Team = field(default_factory=lambda: Team(name="AwayTeam"))
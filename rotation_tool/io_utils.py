@@ -1,7 +1,10 @@
 # rotation_tool/io_utils.py
-from typing import List, Dict
+from typing import Dict
+import codecs
+import csv
 import io
 import re
+import numpy as np
 import pandas as pd
 from rotation_tool.data_model import GameData, Team, Player
 
@@ -26,6 +29,18 @@ HEADERS = [
 ]
 STINT_COLS = [f"Stint {i} minutes" for i in range(9)]
 
+# Parse-time dtypes, so the C parser does the numeric conversion
+HEADER_DTYPES = {
+    "Team": str,
+    "Player id": str,
+    "Player name": str,
+    "Rotation archetype id": str,
+    "Expected typical minutes": "float64",
+    "Closer weighting": "float64",
+    "StandardDeviationScaler": "float64",
+    **{c: "float64" for c in STINT_COLS},
+}
+
 # Minimal set that must be present to build rows
 REQUIRED_HEADERS = {
     "Team",
@@ -42,25 +57,44 @@ REQUIRED_HEADERS = {
 # -----------------------
 
 
-def _coerce_float(val, default=None):
-    """Coerce to float, tolerating blanks, NaN, and '1,234.5' values."""
-    if pd.isna(val) or val == "":
-        return default
+def _numeric(col: pd.Series) -> pd.Series:
+    """Coerce a column to float; tolerates '1,234.5', blanks/junk become NaN."""
+    if col.dtype == object:
+        col = col.astype(str).str.strip().str.replace(",", "", regex=False)
+    return pd.to_numeric(col, errors="coerce")
+
+
+def _read_known_columns(raw: bytes, sep, engine: str, encoding: str) -> pd.DataFrame:
+    """
+    Read only the columns that map onto HEADERS, typed at parse time where possible.
+    Sniffs the header row first; if nothing maps, reads everything so the caller
+    can report what's missing.
+    """
+    opts = dict(sep=sep, engine=engine, encoding=encoding)
+    header = pd.read_csv(io.BytesIO(raw), nrows=0, **opts).columns
+
+    expected_map: Dict[str, str] = {h.lower(): h for h in HEADERS}
+    mapped = {c: expected_map.get(_normalize_column(c).lower()) for c in header}
+    usecols = [c for c, h in mapped.items() if h]
+    if not usecols:
+        return pd.read_csv(io.BytesIO(raw), **opts)
+
     try:
-        if isinstance(val, str):
-            val = val.strip().replace(",", "")
-            if val == "":
-                return default
-        return float(val)
-    except Exception:
-        return default
+        dtype = {c: HEADER_DTYPES[mapped[c]] for c in usecols}
+        return pd.read_csv(io.BytesIO(raw), usecols=usecols, dtype=dtype, **opts)
+    except UnicodeDecodeError:
+        raise
+    except (ValueError, TypeError):
+        # e.g. '1,234.5' in a numeric column; load_csv cleans those up per column
+        return pd.read_csv(io.BytesIO(raw), usecols=usecols, **opts)
 
 
 def _read_dataframe_from_uploaded(file_like) -> pd.DataFrame:
     """
     Robustly read CSV from Streamlit's UploadedFile or any file-like.
-    - Reads raw bytes once, then tries UTF-8-SIG -> UTF-8 -> Latin-1.
-    - Uses delimiter inference (sep=None, engine='python').
+    - Reads raw bytes once; pandas decodes them (UTF-8, BOM-aware; Latin-1 if not UTF-8).
+    - Tries the fast C parser (comma-separated) first, then delimiter inference
+      (sep=None, engine='python') when that fails or yields a single column.
     - Returns a DataFrame or raises ValueError with a friendly message.
     """
     # Get raw bytes (don't consume the file-like permanently)
@@ -76,19 +110,28 @@ def _read_dataframe_from_uploaded(file_like) -> pd.DataFrame:
     if not raw:
         raise ValueError("The uploaded file is empty.")
 
+    encoding = "utf-8-sig" if raw.startswith(codecs.BOM_UTF8) else "utf-8"
+
     last_err = None
-    for encoding in ("utf-8-sig", "utf-8", "latin1"):
+    attempts = (
+        # Common path: plain comma CSV, parsed in C
+        (",", "c", 2),
+        # sep=None => sniff delimiter; engine='python' is flexible
+        (None, "python", 1),
+    )
+    for sep, engine, min_cols in attempts:
         try:
-            text = raw.decode(encoding, errors="strict")
-            sio = io.StringIO(text)
-            # sep=None => sniff delimiter; engine='python' is flexible
-            df = pd.read_csv(sio, sep=None, engine="python")
-            if df is None or df.shape[1] == 0:
-                continue
-            return df
+            try:
+                df = _read_known_columns(raw, sep, engine, encoding)
+            except UnicodeDecodeError:
+                # Not UTF-8: Latin-1 maps every byte, so this decode cannot fail
+                encoding = "latin1"
+                df = _read_known_columns(raw, sep, engine, encoding)
         except Exception as ex:
             last_err = ex
             continue
+        if df is not None and df.shape[1] >= min_cols:
+            return df
 
     raise ValueError(
         "Could not parse the uploaded CSV. "
@@ -96,46 +139,34 @@ def _read_dataframe_from_uploaded(file_like) -> pd.DataFrame:
     ) from last_err
 
 
-def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+def _normalize_column(c) -> str:
     """
     Strip BOM/whitespace, collapse inner spaces. Keeps original casing otherwise.
     """
+    if not isinstance(c, str):
+        c = str(c)
+    c = c.replace("\ufeff", "")  # drop BOM if present
+    c = c.strip()
+    c = re.sub(r"\s+", " ", c)
+    return c
 
-    def norm(c: str) -> str:
-        if not isinstance(c, str):
-            c = str(c)
-        c = c.replace("\ufeff", "")  # drop BOM if present
-        c = c.strip()
-        c = re.sub(r"\s+", " ", c)
-        return c
-
-    df = df.copy()
-    df.columns = [norm(c) for c in df.columns]
-    return df
 
-
-def _map_columns_to_expected(df: pd.DataFrame) -> pd.DataFrame:
+def _map_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Map normalized incoming columns to our exact HEADERS where possible.
+    Normalize incoming columns and map them to our exact HEADERS where possible,
+    in a single rename (no copy of the underlying data).
     This is tolerant to minor spacing/case quirks but will not invent columns.
     """
-    norm_df = _normalize_columns(df)
-
     # Build a case-insensitive lookup for expected headers
     expected_map: Dict[str, str] = {h.lower(): h for h in HEADERS}
 
-    new_cols = []
-    for c in norm_df.columns:
-        key = c.lower()
-        mapped = expected_map.get(key)
-        if mapped:
-            new_cols.append(mapped)
-        else:
-            # keep unknowns as-is; we won't rely on them
-            new_cols.append(c)
+    mapping = {}
+    for c in df.columns:
+        norm = _normalize_column(c)
+        # keep unknowns as-is (normalized); we won't rely on them
+        mapping[c] = expected_map.get(norm.lower(), norm)
 
-    norm_df.columns = new_cols
-    return norm_df
+    return df.rename(columns=mapping, copy=False)
 
 
 # -----------------------
@@ -149,7 +180,7 @@ def load_csv(file_like) -> GameData:
     Raises ValueError with a friendly message on structural problems.
     """
     df_raw = _read_dataframe_from_uploaded(file_like)
-    df = _map_columns_to_expected(df_raw)
+    df = _map_columns(df_raw)
 
     # Validate required headers
     missing = [h for h in REQUIRED_HEADERS if h not in df.columns]
@@ -157,69 +188,86 @@ def load_csv(file_like) -> GameData:
         raise ValueError("CSV is missing required columns: " + ", ".join(missing))
 
     game = GameData()
-    home_players: List[Player] = []
-    away_players: List[Player] = []
-
-    # Iterate rows
-    for _, row in df.iterrows():
-        team_val = str(row.get("Team", "")).strip()
-        if team_val not in ("HomeTeam", "AwayTeam"):
-            # ignore rows for other teams / garbage
-            continue
 
-        player = Player(
-            player_id=str(row.get("Player id", "")).strip(),
-            name=str(row.get("Player name", "")).strip(),
+    # Ignore rows for other teams / garbage
+    df = df[df["Team"].astype(str).str.strip().isin(["HomeTeam", "AwayTeam"])]
+
+    def _str_col(col: str) -> np.ndarray:
+        return df[col].astype(str).str.strip().to_numpy()
+
+    def _float_col(col: str, default: float) -> np.ndarray:
+        return _numeric(df[col]).fillna(default).to_numpy(dtype=np.float64)
+
+    teams = _str_col("Team")
+    pids = _str_col("Player id")
+    names = _str_col("Player name")
+    # Blank cells come through as NaN; keep them as None rather than "nan"
+    archs = df["Rotation archetype id"].fillna("").astype(str).str.strip().to_numpy()
+    exp_mins = _float_col("Expected typical minutes", 0.0)
+    closers = _float_col("Closer weighting", 0.0)
+    scalers = _float_col("StandardDeviationScaler", 1.0)
+
+    # (N, 9) stint matrix; absent columns are all-NaN and get dropped per row
+    stint_arr = (
+        df.reindex(columns=STINT_COLS).apply(_numeric).to_numpy(dtype=np.float64)
+    )
+
+    players = [
+        Player(
+            player_id=pid,
+            name=name,
             team=team_val,
-            archetype_id=(str(row.get("Rotation archetype id", "")).strip() or None),
-            expected_minutes=_coerce_float(row.get("Expected typical minutes"), 0.0)
-            or 0.0,
-            closer_weighting=_coerce_float(row.get("Closer weighting"), 0.0) or 0.0,
-            stddev_scaler=_coerce_float(row.get("StandardDeviationScaler"), 1.0) or 1.0,
+            archetype_id=arch or None,
+            expected_minutes=float(exp_min) or 0.0,
+            closer_weighting=float(closer) or 0.0,
+            stddev_scaler=float(scaler) or 1.0,
+            # Collect stint minutes (ignore blanks)
+            stints_raw=row[~np.isnan(row)].tolist(),
         )
-
-        # Collect stint minutes (ignore blanks)
-        raw: List[float] = []
-        for col in STINT_COLS:
-            if col in df.columns:
-                v = _coerce_float(row.get(col), None)
-                if v is not None:
-                    raw.append(v)
-        player.stints_raw = raw
-
-        if team_val == "HomeTeam":
-            home_players.append(player)
-        else:
-            away_players.append(player)
+        for team_val, pid, name, arch, exp_min, closer, scaler, row in zip(
+            teams, pids, names, archs, exp_mins, closers, scalers, stint_arr
+        )
+    ]
+    home_players = [p for p in players if p.team == "HomeTeam"]
+    away_players = [p for p in players if p.team == "AwayTeam"]
 
     game.home_team.players = home_players
     game.away_team.players = away_players
     return game
 
 
-def export_csv(game: GameData) -> pd.DataFrame:
+def export_csv(game: GameData) -> bytes:
     """
-    Transform GameData back to the exact CSV column layout.
-    Always returns a DataFrame with HEADERS even if there are no players.
+    Transform GameData back to the exact CSV column layout, as UTF-8 bytes.
+    Always emits the HEADERS row even if there are no players.
     """
-    rows = []
+    # Encode straight into the byte buffer (no intermediate str + .encode() copy)
+    buf = io.BytesIO()
+    text = io.TextIOWrapper(buf, encoding="utf-8", newline="")
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(HEADERS)
 
     def _rows_for_team(team: Team):
         for p in team.players:
-            row = {
-                "Team": p.team,
-                "Player id": p.player_id,
-                "Player name": p.name,
-                "Expected typical minutes": p.expected_minutes,
-                "Rotation archetype id": p.archetype_id or "",
-                "Closer weighting": p.closer_weighting,
-                "StandardDeviationScaler": p.stddev_scaler,
-            }
-            for i, col in enumerate(STINT_COLS):
-                row[col] = p.stints_raw[i] if i < len(p.stints_raw) else ""
-            rows.append(row)
+            writer.writerow(
+                (
+                    p.team,
+                    p.player_id,
+                    p.name,
+                    p.expected_minutes,
+                    p.archetype_id or "",
+                    p.closer_weighting,
+                    *[
+                        p.stints_raw[i] if i < len(p.stints_raw) else ""
+                        for i in range(len(STINT_COLS))
+                    ],
+                    p.stddev_scaler,
+                )
+            )
 
     _rows_for_team(game.home_team)
     _rows_for_team(game.away_team)
 
-    return pd.DataFrame(rows, columns=HEADERS)
+    text.flush()
+    text.detach()  # keep buf open once the wrapper is collected
+    return buf.getvalue()
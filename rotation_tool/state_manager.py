@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
 from rotation_tool.data_model import Team, Player
-from math import isclose
+import numpy as np
 from rotation_tool.archetypes import ARCHETYPES
 
 
@@ -18,8 +19,9 @@ class Config:
         self.archetypes = archetypes
 
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Load archetypes directly from the embedded dictionary."""
+    """Load archetypes directly from the embedded dictionary (built once, then shared)."""
     data = ARCHETYPES
     arch_map = {}
     for item in data["archetypes"]:
@@ -33,6 +35,32 @@ def get_config() -> Config:
     return Config(arch_map)
 
 
+class _ArchMeta(NamedTuple):
+    """Per-archetype lookups specialized once at import for the hot segment math."""
+
+    pattern: Tuple[str, ...]
+    on_idx: Tuple[int, ...]
+    off_idx: Tuple[int, ...]
+    on_mask: np.ndarray  # bool, True where the pattern is "on"
+    length: int
+
+
+def _arch_meta(pattern: List[str]) -> _ArchMeta:
+    on = [tag == "on" for tag in pattern]
+    return _ArchMeta(
+        pattern=tuple(pattern),
+        on_idx=tuple(i for i, is_on in enumerate(on) if is_on),
+        off_idx=tuple(i for i, is_on in enumerate(on) if not is_on),
+        on_mask=np.array(on, dtype=bool),
+        length=len(pattern),
+    )
+
+
+_ARCH_META: Dict[str, _ArchMeta] = {
+    a["id"]: _arch_meta(a["stint_pattern"]) for a in ARCHETYPES["archetypes"]
+}
+
+
 # ----- Validation helpers -----
 def closer_sum(team: Team) -> float:
     # Clamp each player to [0,1] to avoid weird inputs, then sum
@@ -44,15 +72,11 @@ def closer_status(total: float, tol: float = 0.01) -> str:
     return "ok" if abs(total - 5.0) <= tol else "bad"
 
 
-def split_on_off_indices(archetype_id: str) -> Tuple[List[int], List[int]]:
-    cfg = get_config()
-    arch = cfg.archetypes.get(archetype_id)
-    if not arch:
-        return [], []
-    on_idx, off_idx = [], []
-    for i, tag in enumerate(arch.stint_pattern):
-        (on_idx if tag == "on" else off_idx).append(i)
-    return on_idx, off_idx
+def split_on_off_indices(archetype_id: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    meta = _ARCH_META.get(archetype_id)
+    if not meta:
+        return (), ()
+    return meta.on_idx, meta.off_idx
 
 
 def split_on_off_sums(player: Player) -> Tuple[float, float] | None:
@@ -65,23 +89,17 @@ def split_on_off_sums(player: Player) -> Tuple[float, float] | None:
 
 
 # ----- NEW: Make concrete [start,end] segments for the timeline -----
-def _ensure_default_percentages(player: Player) -> List[float]:
+def _ensure_default_percentages(
+    stints_raw: List[float], meta: _ArchMeta
+) -> List[float]:
     """
     Ensure stints_raw matches the archetype length and has sensible defaults.
     - If sums for 'on' or 'off' are zero, distribute equally within that group.
     - Keep any existing numbers as-is (no auto-normalize to 1.0 — validation will flag).
     """
-    if not player.archetype_id:
-        return player.stints_raw
-
-    cfg = get_config()
-    arch = cfg.archetypes.get(player.archetype_id)
-    if not arch:
-        return player.stints_raw
-
-    L = len(arch.stint_pattern)
-    raw = list(player.stints_raw) + [0.0] * max(0, L - len(player.stints_raw))
-    on_idx, off_idx = split_on_off_indices(player.archetype_id)
+    L = meta.length
+    raw = list(stints_raw) + [0.0] * max(0, L - len(stints_raw))
+    on_idx, off_idx = meta.on_idx, meta.off_idx
 
     # If all zeros in a group, fill equal shares
     on_sum = sum(raw[i] for i in on_idx)
@@ -107,55 +125,75 @@ def compute_segments(player: Player) -> List[Tuple[float, float, str]]:
     Uses expected_minutes + stints_raw percentages.
     IMPORTANT: No proportional rescaling — honors the implicit 48 total from apply_boundaries.
     """
-    if not player.archetype_id:
-        return []
+    return list(
+        segments_for(
+            player.archetype_id,
+            float(player.expected_minutes or 0.0),
+            tuple(player.stints_raw),
+        )
+    )
 
-    cfg = get_config()
-    arch = cfg.archetypes.get(player.archetype_id)
-    if not arch:
-        return []
 
-    raw = _ensure_default_percentages(player)
-    on_idx, off_idx = split_on_off_indices(player.archetype_id)
+@lru_cache(maxsize=1024)
+def segments_for(
+    archetype_id: str | None, expected_minutes: float, stints_raw: Tuple[float, ...]
+) -> Tuple[Tuple[float, float, str], ...]:
+    """
+    compute_segments on hashable primitives, memoized since Streamlit recomputes
+    every player on every rerun.
+    """
+    meta = _ARCH_META.get(archetype_id)
+    if not meta:
+        return ()
+    return tuple(_compute_segments(meta, expected_minutes, list(stints_raw)))
+
 
-    on_total = max(0.0, min(48.0, float(player.expected_minutes or 0.0)))
+def _compute_segments(
+    meta: _ArchMeta, expected_minutes: float, stints_raw: List[float]
+) -> List[Tuple[float, float, str]]:
+    raw = _ensure_default_percentages(stints_raw, meta)
+
+    on_total = max(0.0, min(48.0, expected_minutes))
     off_total = max(0.0, 48.0 - on_total)
 
     # Durations in archetype order
-    durations: List[float] = []
-    for i, tag in enumerate(arch.stint_pattern):
-        pct = raw[i] if i < len(raw) else 0.0
-        if tag == "on":
-            durations.append((pct * on_total) if on_total > 0 else 0.0)
-        else:
-            durations.append((pct * off_total) if off_total > 0 else 0.0)
+    L = meta.length
+    raw_arr = np.zeros(L, dtype=np.float64)
+    raw_arr[: len(raw)] = raw[:L]
+    durations = np.where(meta.on_mask, raw_arr * on_total, raw_arr * off_total)
 
     # Accumulate to [start,end], without any global scaling
-    segs: List[Tuple[float, float, str]] = []
-    t = 0.0
-    for i, tag in enumerate(arch.stint_pattern):
-        d = max(0.0, durations[i])
-        start = t
-        end = min(48.0, start + d)
-        segs.append((start, end, tag))
-        t = end
-
-    # Ensure we always end at 48.0 (tiny drift guard)
-    if segs:
-        s, _, tag = segs[-1]
-        segs[-1] = (s, 48.0, tag)
+    ends = np.minimum(np.cumsum(np.maximum(durations, 0.0)), 48.0)
+    if L:
+        # Ensure we always end at 48.0 (tiny drift guard)
+        ends[-1] = 48.0
+    starts = np.concatenate([[0.0], ends[:-1]])
 
-    return segs
+    return list(zip(starts.tolist(), ends.tolist(), meta.pattern))
 
 
 def compute_default_boundaries(player: Player) -> List[float]:
     """
     Return the default boundary list (end time of each stint) excluding the final 48.
-    Uses compute_segments(player) to get current [start,end] per stint.
+    Uses the player's current [start,end] segments.
     """
-    segs = compute_segments(player)
+    return list(
+        default_boundaries_for(
+            player.archetype_id,
+            float(player.expected_minutes or 0.0),
+            tuple(player.stints_raw),
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def default_boundaries_for(
+    archetype_id: str | None, expected_minutes: float, stints_raw: Tuple[float, ...]
+) -> Tuple[float, ...]:
+    """compute_default_boundaries on hashable primitives, memoized like segments_for."""
+    segs = segments_for(archetype_id, expected_minutes, stints_raw)
     if not segs:
-        return []
+        return ()
     # end times of all but the last segment (which ends at 48 by definition)
     ends = [end for (_, end, _) in segs[:-1]]
     # Clamp to [0,48] and strictly increasing (best-effort)
@@ -165,7 +203,24 @@ def compute_default_boundaries(player: Player) -> List[float]:
         val = max(last + 0.001, min(48.0, float(e)))
         out.append(val)
         last = val
-    return out
+    return tuple(out)
+
+
+def sanitize_ends(ends: List[float], length: int, min_gap: float = 0.001) -> np.ndarray:
+    """
+    Make end-times for a `length`-stint archetype strictly increasing in (0,48):
+    returns length-1 ends, each at least min_gap after the previous one and leaving
+    room for the stints after it.
+    """
+    # Sequentially: end_k = max(end_{k-1} + gap, min(cap_k, ends[k])), with each cap
+    # leaving room for the stints after it. Shifting by (k+1)*gap turns that into a
+    # running max. Missing ends are -inf, i.e. "previous end + gap".
+    k_gap = np.arange(1, length) * min_gap
+    caps = 48.0 - k_gap[::-1] + min_gap
+    given = np.full(length - 1, -np.inf)
+    given[: min(len(ends), length - 1)] = ends[: length - 1]
+    shifted = np.maximum(np.minimum(caps, given) - k_gap, 0.0)
+    return np.maximum.accumulate(shifted) + k_gap
 
 
 def apply_boundaries(player: Player, ends: List[float], min_gap: float = 0.001) -> None:
@@ -176,105 +231,95 @@ def apply_boundaries(player: Player, ends: List[float], min_gap: float = 0.001)
         * player.expected_minutes  = total of 'on' durations
         * player.stints_raw[i]     = duration_i / (on_total or off_total)
     """
-    if not player.archetype_id:
-        return
-    cfg = get_config()
-    arch = cfg.archetypes.get(player.archetype_id)
-    if not arch:
+    meta = _ARCH_META.get(player.archetype_id)
+    if not meta:
         return
 
-    L = len(arch.stint_pattern)
+    L = meta.length
     if L <= 0:
         return
 
-    # Sanitize incoming ends → strictly increasing in (0,48), length L-1
-    ends = list(ends[: L - 1])
-    out_ends: List[float] = []
-    last = 0.0
-    for k in range(L - 1):
-        raw = float(ends[k] if k < len(ends) else last + min_gap)
-        val = max(last + min_gap, min(48.0 - (L - 1 - (k + 1)) * min_gap, raw))
-        out_ends.append(val)
-        last = val
-
-    # Build [start,end] segments from boundaries
-    seg_starts: List[float] = []
-    seg_ends: List[float] = []
-    t = 0.0
-    for e in out_ends:
-        seg_starts.append(t)
-        seg_ends.append(e)
-        t = e
-    # final segment to 48
-    seg_starts.append(t)
-    seg_ends.append(48.0)
+    # Build [start,end] segments from boundaries (final segment runs to 48)
+    seg_ends = np.empty(L)
+    seg_ends[:-1] = sanitize_ends(ends, L, min_gap)
+    seg_ends[-1] = 48.0
+    seg_starts = np.empty(L)
+    seg_starts[0] = 0.0
+    seg_starts[1:] = seg_ends[:-1]
 
     # Durations and totals
-    durations = [max(0.0, seg_ends[i] - seg_starts[i]) for i in range(L)]
-    on_idx, off_idx = split_on_off_indices(player.archetype_id)
-    on_total = sum(durations[i] for i in on_idx)
-    off_total = sum(durations[i] for i in off_idx)
+    durations = np.maximum(seg_ends - seg_starts, 0.0)
+    on_mask = meta.on_mask
+    on_total = float(durations[on_mask].sum())
+    off_total = float(durations[~on_mask].sum())
 
     # Update expected minutes to reflect 'on' total
     player.expected_minutes = max(0.0, min(48.0, on_total))
 
     # Update stints_raw percentages from durations (robust to zero totals)
-    raw: List[float] = [0.0] * L
-    for i in on_idx:
-        raw[i] = durations[i] / on_total if on_total > 0 else 0.0
-    for i in off_idx:
-        raw[i] = durations[i] / off_total if off_total > 0 else 0.0
-    player.stints_raw = raw
+    raw = np.zeros(L)
+    if on_total > 0:
+        raw[on_mask] = durations[on_mask] / on_total
+    if off_total > 0:
+        raw[~on_mask] = durations[~on_mask] / off_total
+    player.stints_raw = raw.tolist()
 
 
 def team_oncourt_steps(team) -> Tuple[List[float], List[int]]:
     """
     Return piecewise-constant step series (xs, ys) over [0,48] for how many players are on court.
-    Uses compute_segments(player) and counts "on" segments across all players.
+    Counts "on" segments across all players (see oncourt_steps_for).
     """
-    events: List[Tuple[float, int]] = []  # (time, delta)
-    for p in team.players:
-        segs = compute_segments(p)
-        for s, e, tag in segs:
-            if tag == "on" and e > s:
-                s = max(0.0, min(48.0, float(s)))
-                e = max(0.0, min(48.0, float(e)))
-                events.append((s, +1))
-                events.append((e, -1))
+    return oncourt_steps_for(
+        (p.archetype_id, float(p.expected_minutes or 0.0), tuple(p.stints_raw))
+        for p in team.players
+    )
 
-    # Ensure we always have the domain
-    events.append((0.0, 0))
-    events.append((48.0, 0))
+
+def oncourt_steps_for(
+    rotations: Iterable[Tuple[str | None, float, Tuple[float, ...]]],
+) -> Tuple[List[float], List[int]]:
+    """
+    team_oncourt_steps on (archetype_id, expected_minutes, stints_raw) tuples, one per
+    player, so callers holding only those primitives needn't build Player objects.
+    """
+    starts: List[float] = []
+    ends: List[float] = []
+    for arch_id, exp_m, raw in rotations:
+        for s, e, tag in segments_for(arch_id, exp_m, raw):
+            if tag == "on" and e > s:
+                starts.append(s)
+                ends.append(e)
+
+    # Events as (time, delta); 0 and 48 are always present so we cover the domain
+    times = np.clip(
+        np.concatenate([starts, ends, [0.0, 48.0]]).astype(np.float64), 0.0, 48.0
+    )
+    deltas = np.concatenate(
+        [
+            np.ones(len(starts), dtype=np.int64),
+            -np.ones(len(ends), dtype=np.int64),
+            np.zeros(2, dtype=np.int64),
+        ]
+    )
 
     # Sort, and for ties apply all -1 before +1 so a sub-out at t and sub-in at t keeps count consistent
-    events.sort(key=lambda x: (x[0], x[1]))
-
-    xs: List[float] = []
-    ys: List[int] = []
-    curr = 0
-    last_t = 0.0
-
-    # Build right-constant steps (Plotly shape='hv' handles the visual)
-    for t, d in events:
-        t = float(t)
-        if not xs:
-            xs.append(last_t)
-            ys.append(curr)
-        if t != last_t:
-            xs.append(t)
-            ys.append(curr)  # horizontal run to t
-            last_t = t
-        curr += d
-        xs.append(t)
-        ys.append(curr)  # vertical jump at t
-
-    # Clamp domain and tidy duplicates
-    # (Plotly tolerates duplicates; this keeps arrays small)
-    out_x, out_y = [xs[0]], [ys[0]]
-    for i in range(1, len(xs)):
-        if not (isclose(xs[i], out_x[-1]) and ys[i] == out_y[-1]):
-            out_x.append(xs[i])
-            out_y.append(ys[i])
+    order = np.lexsort((deltas, times))
+    times = times[order]
+    after = np.cumsum(deltas[order])
+    before = np.concatenate([[0], after[:-1]])
+
+    # Right-constant steps (Plotly shape='hv' handles the visual): a horizontal run
+    # to t at the old count, then a vertical jump at t to the new count
+    xs = np.concatenate([[0.0], np.repeat(times, 2)])
+    ys = np.concatenate([[0], np.column_stack([before, after]).ravel()])
+
+    # Tidy duplicates (Plotly tolerates them; this keeps arrays small). Same tolerance
+    # as math.isclose: numpy's default rtol would merge real steps ~1e-4 min apart
+    same_x = np.isclose(xs[1:], xs[:-1], rtol=1e-9, atol=0.0)
+    keep = np.concatenate([[True], ~(same_x & (ys[1:] == ys[:-1]))])
+    out_x = xs[keep].tolist()
+    out_y = ys[keep].tolist()
 
     # Ensure final point at 48
     if out_x[-1] != 48.0:
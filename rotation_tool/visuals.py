@@ -1,14 +1,20 @@
+from typing import List, Sequence
+import hashlib
+import math
+import struct
 import streamlit as st
 import plotly.graph_objects as go
 from rotation_tool.data_model import Team, Player
 from rotation_tool.state_manager import (
+    Config,
     closer_sum,
     closer_status,
     get_config,
-    compute_segments,
+    segments_for,
     compute_default_boundaries,
     apply_boundaries,
-    team_oncourt_steps,
+    sanitize_ends,
+    oncourt_steps_for,
 )
 
 MAIN_COL_SPECS = [0.9, 4.0, 5.0]
@@ -21,6 +27,12 @@ CTRL_COL_SPECS = [
     1.0,
 ]
 
+# Rows use one flat st.columns call (no nested column groups): the controls' widths
+# are CTRL_COL_SPECS scaled to fill the last MAIN_COL_SPECS slot
+ROW_COL_SPECS = MAIN_COL_SPECS[:2] + [
+    w * MAIN_COL_SPECS[2] / sum(CTRL_COL_SPECS) for w in CTRL_COL_SPECS
+]
+
 # Timeline config
 TICK_VALS = [0, 12, 24, 36, 48]
 TICK_TEXT = ["0", "12", "24", "36", "48"]
@@ -31,29 +43,140 @@ COLOR_ON_BENCH = "#3B82F6"
 COLOR_OFF = "#20252C"
 BOUNDARY_COLOR = "#6b7280"
 
+# Timelines are read-only (fixed ranges, no drag): render them as static plots so each
+# row mounts without Plotly's hover/zoom handlers or modebar
+TIMELINE_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
+# Smallest stint the stints editor allows between consecutive end-times (minutes)
+END_MIN_GAP = 0.001
+
+# Fixed axis/layout settings for every timeline figure (Plotly copies them on assignment)
+_XAXIS_CONF = dict(
+    range=[0, 48],
+    tickmode="array",
+    tickvals=TICK_VALS,
+    ticktext=TICK_TEXT,
+    tickfont=dict(size=9),
+    showgrid=True,
+    zeroline=False,
+    showline=True,
+    mirror=True,
+    ticks="outside",
+    fixedrange=True,
+)
+_YAXIS_CONF = dict(visible=False, fixedrange=True, range=[0, 1])
+_LAYOUT_CONF = dict(
+    height=TIMELINE_HEIGHT,
+    margin=dict(l=0, r=0, t=0, b=0),
+    showlegend=False,
+    dragmode=False,
+)
+
 
-def _is_starter_like(player: Player) -> bool:
+def _is_starter_like(player: Player, cfg: Config) -> bool:
     """Starter = archetype.is_starter OR archetype == 'Star'."""
     if not player.archetype_id:
         return False
-    cfg = get_config()
     arch = cfg.archetypes.get(player.archetype_id)
     if not arch:
         return False
     return bool(getattr(arch, "starter", False) or player.archetype_id == "Star")
 
 
+def _set_if_changed(key: str, val):
+    """Write a session_state value only when it differs (floats compared with a tolerance)."""
+    ss = st.session_state
+    if key in ss:
+        cur = ss[key]
+        if isinstance(val, float) and isinstance(cur, float):
+            if math.isclose(cur, val, rel_tol=1e-9, abs_tol=1e-6):
+                return
+        elif cur == val:
+            return
+    ss[key] = val
+
+
 def _prev_keys(pid: str):
     return (f"prev_arch_{pid}", f"prev_exp_{pid}", f"ends_{pid}")
 
 
-def _sync_ends_from_current(player):
+def _ends_sig(player: Player) -> tuple:
+    return (
+        player.archetype_id,
+        float(player.expected_minutes),
+        tuple(player.stints_raw),
+    )
+
+
+def _store_ends(player: Player, ends: List[float]):
+    """Cache editor end-times together with the rotation they describe."""
+    _set_if_changed(f"ends_{player.player_id}", ends)
+    _set_if_changed(f"ends_sig_{player.player_id}", _ends_sig(player))
+
+
+def _ensure_ends_cache(player: Player) -> List[float]:
     """
-    Recompute end-times from the player's current (archetype, expected_minutes, stints_raw)
-    and store them in session state so the editor matches the plot.
+    End-times for the player's current (archetype, expected_minutes, stints_raw), kept in
+    session state so the editor matches the plot. Recomputed only when that rotation
+    differs from the one the cached ends were stored for.
     """
     ends_key = f"ends_{player.player_id}"
-    st.session_state[ends_key] = compute_default_boundaries(player)
+    if (
+        ends_key not in st.session_state
+        or st.session_state.get(f"ends_sig_{player.player_id}") != _ends_sig(player)
+    ):
+        _store_ends(player, compute_default_boundaries(player))
+    return st.session_state[ends_key]
+
+
+def _open_editor(player: Player):
+    st.session_state[f"editing_{player.player_id}"] = True
+    # ensure ends are in sync when opening editor
+    _ensure_ends_cache(player)
+
+
+def _seed_end_inputs(pid: str, ends: List[float]):
+    """Write end-times into the editor's inputs (clamped to each input's bounds)."""
+    n = len(ends)
+    for i, e in enumerate(ends):
+        lo, hi = (i + 1) * END_MIN_GAP, 48.0 - (n - 1 - i) * END_MIN_GAP
+        st.session_state[f"end_{pid}_{i}"] = float(min(max(e, lo), hi))
+    st.session_state[f"end_seed_{pid}"] = list(ends)
+
+
+def _apply_ends(player: Player, L: int):
+    """Apply button callback: commit the form's end-times to the player."""
+    pid = player.player_id
+    raw_ends = [float(st.session_state[f"end_{pid}_{i}"]) for i in range(L - 1)]
+
+    # Inputs are bounded independently inside the form, so enforce ordering here
+    new_ends = sanitize_ends(raw_ends, L, END_MIN_GAP).tolist()
+
+    apply_boundaries(player, new_ends, min_gap=END_MIN_GAP)
+    _store_ends(player, new_ends)
+    # show the normalized ends, not what was typed
+    _seed_end_inputs(pid, new_ends)
+
+    # keep the Expected Minutes widget in sync with the new computed value, and mark
+    # it as seen so the app rerun doesn't treat it as a fresh edit
+    _set_if_changed(f"exp_{pid}", float(player.expected_minutes))
+    st.session_state[_prev_keys(pid)[1]] = float(player.expected_minutes)
+    st.session_state[f"ends_applied_{pid}"] = True
+
+
+def _close_editor(player: Player):
+    _ensure_ends_cache(player)  # keep ends cached to match the plot
+    # the inputs' state goes once they stop rendering; reopening reseeds from ends_{pid}
+    st.session_state.pop(f"end_seed_{player.player_id}", None)
+    st.session_state[f"editing_{player.player_id}"] = False
+    # sync Expected Minutes widget so it doesn't snap back
+    _set_if_changed(f"exp_{player.player_id}", float(player.expected_minutes))
+
+
+_HEADER_TMPL = (
+    "**{name}**  ·  Closer total: "
+    "<span style='background:{color};color:white;padding:1px 8px;border-radius:12px;'>{total:.2f} / 5.00</span>"
+)
 
 
 def _team_header(team: Team):
@@ -61,104 +184,126 @@ def _team_header(team: Team):
     status = closer_status(total)
     color = "#16a34a" if status == "ok" else "#dc2626"
     st.markdown(
-        f"**{team.name}**  ·  Closer total: "
-        f"<span style='background:{color};color:white;padding:1px 8px;border-radius:12px;'>{total:.2f} / 5.00</span>",
+        _HEADER_TMPL.format(name=team.name, color=color, total=total),
         unsafe_allow_html=True,
     )
     if status != "ok":
         st.caption("Closer weighting must total 5.00 (±0.01).")
 
 
+def _sig_floats(values: Sequence[float]) -> str:
+    """Short stable digest of a float sequence (packed bytes, no per-value formatting)."""
+    packed = struct.pack(f"{len(values)}d", *values)
+    return hashlib.blake2b(packed, digest_size=8).hexdigest()
+
+
 def _timeline_key(player: Player) -> str:
     """Key depends on archetype, expected minutes, and the *values* of stints_raw."""
-    nonce = st.session_state.get("render_nonce", 0)
-    raw_sig = "_".join(
-        f"{x:.4f}" for x in player.stints_raw
-    )  # captures value changes even if same length
+    raw_sig = _sig_floats(player.stints_raw)  # captures value changes even if same length
     arch = player.archetype_id or "NotSet"
-    return f"tl_{player.team}_{player.player_id}_{arch}_{float(player.expected_minutes):.2f}_{raw_sig}_{nonce}"
+    return f"tl_{player.team}_{player.player_id}_{arch}_{float(player.expected_minutes):.4f}_{raw_sig}"
 
 
-def _timeline(player: Player):
-    segs = compute_segments(player)  # [(start, end, tag)]
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _build_timeline_fig(
+    arch_id: str | None, exp_m: float, stints_raw: tuple, is_starter: bool
+) -> go.Figure:
+    """
+    Build a player's timeline figure once per signature. Shared via cache_resource
+    (never mutated after build) so cache hits skip Plotly object construction.
+    """
+    segs = segments_for(arch_id, exp_m, stints_raw)  # [(start, end, tag)]
+    on_color = COLOR_ON_STARTER if is_starter else COLOR_ON_BENCH
     fig = go.Figure()
 
+    # Collect every shape as a plain dict and hand them to Plotly in one layout update
     # boundaries at 0 and 48
-    fig.add_vline(x=0, line_width=1, line_dash="solid", line_color=BOUNDARY_COLOR)
-    fig.add_vline(x=48, line_width=1, line_dash="solid", line_color=BOUNDARY_COLOR)
+    shapes = [
+        dict(
+            type="line",
+            x0=x,
+            x1=x,
+            y0=0,
+            y1=1,
+            xref="x",
+            yref="y domain",
+            line=dict(color=BOUNDARY_COLOR, dash="solid", width=1),
+        )
+        for x in (0, 48)
+    ]
 
     # draw segments as rectangles
     for start, end, tag in segs:
         if end <= start:
             continue
-        fig.add_shape(
-            type="rect",
-            x0=start,
-            x1=end,
-            y0=0.0,
-            y1=1.0,
-            xref="x",
-            yref="y",
-            line=dict(width=0),
-            fillcolor=(COLOR_ON_STARTER if _is_starter_like(player) else COLOR_ON_BENCH)
-            if tag == "on"
-            else COLOR_OFF,
-            layer="below",
+        shapes.append(
+            dict(
+                type="rect",
+                x0=start,
+                x1=end,
+                y0=0.0,
+                y1=1.0,
+                xref="x",
+                yref="y",
+                line=dict(width=0),
+                fillcolor=on_color if tag == "on" else COLOR_OFF,
+                layer="below",
+            )
         )
-
-    fig.update_xaxes(
-        range=[0, 48],
-        tickmode="array",
-        tickvals=TICK_VALS,
-        ticktext=TICK_TEXT,
-        tickfont=dict(size=9),
-        showgrid=True,
-        zeroline=False,
-        showline=True,
-        mirror=True,
-        ticks="outside",
-        fixedrange=True,
-    )
-    fig.update_yaxes(visible=False, fixedrange=True, range=[0, 1])
-
+    # Axis/layout settings are shared constants; the figure gets them in one layout build
     fig.update_layout(
-        height=TIMELINE_HEIGHT,
-        margin=dict(l=0, r=0, t=0, b=0),
-        showlegend=False,
-        dragmode=False,
+        shapes=shapes, xaxis=_XAXIS_CONF, yaxis=_YAXIS_CONF, **_LAYOUT_CONF
     )
+    return fig
+
 
+def _timeline(player: Player, cfg: Config):
+    fig = _build_timeline_fig(
+        player.archetype_id,
+        float(player.expected_minutes or 0.0),
+        tuple(player.stints_raw),
+        _is_starter_like(player, cfg),
+    )
     st.plotly_chart(
         fig,
         width="stretch",
+        config=TIMELINE_CONFIG,
         key=_timeline_key(player),  # <- dynamic key tied to live values
     )
 
 
 def _controls_header_row():
     """Header row aligned with player rows."""
-    name_col, tl_col, ctrl_col = st.columns(MAIN_COL_SPECS, gap="small")
+    name_col, tl_col, c_arch, c_exp, c_cw, c_sd, c_btn = st.columns(
+        ROW_COL_SPECS, gap="small"
+    )
     with name_col:
         st.caption("Player Name")
     with tl_col:
         st.caption("Rotation Pattern")
-    with ctrl_col:
-        c_arch, c_exp, c_cw, c_sd, c_btn = st.columns(CTRL_COL_SPECS, gap="small")
-        with c_arch:
-            st.caption("Archetype")
-        with c_exp:
-            st.caption("Exp. Minutes")
-        with c_cw:
-            st.caption("Closer Weighting")
-        with c_sd:
-            st.caption("Std Scaler")
-        with c_btn:
-            st.caption("Stints")
-
-
-def _player_row(player: Player):
-    # Create the three aligned columns
-    name_col, tl_col, ctrl_col = st.columns(MAIN_COL_SPECS, gap="small")
+    with c_arch:
+        st.caption("Archetype")
+    with c_exp:
+        st.caption("Exp. Minutes")
+    with c_cw:
+        st.caption("Closer Weighting")
+    with c_sd:
+        st.caption("Std Scaler")
+    with c_btn:
+        st.caption("Stints")
+
+
+@st.fragment
+def _player_row(player: Player, cfg: Config):
+    """
+    One player's row. Runs as a fragment: edits rerun only this row, and we escalate
+    to a full app rerun only when team-level outputs (header, on-court chart, starter
+    grouping) need to change.
+    """
+    # One flat set of aligned columns: name, timeline, then the controls
+    name_col, tl_col, c_arch, c_exp, c_cw, c_sd, c_btn = st.columns(
+        ROW_COL_SPECS, gap="small"
+    )
 
     # 1) Player name (left)
     with name_col:
@@ -169,7 +314,6 @@ def _player_row(player: Player):
         # small spacing
         st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
 
-        cfg = get_config()
         if not player.archetype_id or player.archetype_id not in cfg.archetypes:
             st.warning("Select an archetype first.")
             st.session_state[f"editing_{player.player_id}"] = False
@@ -182,163 +326,145 @@ def _player_row(player: Player):
             st.session_state[f"editing_{player.player_id}"] = False
             st.rerun()
 
-        ends_key = f"ends_{player.player_id}"
-        if ends_key not in st.session_state:
-            st.session_state[ends_key] = compute_default_boundaries(player)
-        if len(st.session_state[ends_key]) != L - 1:
-            st.session_state[ends_key] = compute_default_boundaries(player)
-
-        current_ends = list(st.session_state[ends_key])
-
-        # Horizontal inputs: exactly L-1 columns (t1..t{L-1})
-        cols = st.columns([1] * (L - 1), gap="small")
-        new_ends = []
-        prev = 0.0
-        min_gap = 0.001
-        for i in range(L - 1):
-            remaining = (L - 1) - (i + 1)
-            max_allowed = 48.0 - remaining * min_gap
-            val = current_ends[i] if i < len(current_ends) else prev + min_gap
-            with cols[i]:
-                st.caption(f"t{i + 1}")
-                nv = st.number_input(
-                    f"End Time {i + 1}",
-                    min_value=float(prev + min_gap),
-                    max_value=float(max_allowed),
-                    step=0.5,
-                    value=float(val),
-                    key=f"end_{player.player_id}_{i}",
-                    label_visibility="collapsed",
-                )
-            nv = max(prev + min_gap, min(max_allowed, float(nv)))
-            new_ends.append(nv)
-            prev = nv
-
-        # Apply as user edits (instant update)
-        # Apply as user edits (instant update)
-        apply_boundaries(player, new_ends, min_gap=min_gap)
-        st.session_state[ends_key] = new_ends
-
-        # NEW: keep the Expected Minutes widget in sync with the new computed value
-        exp_key = f"exp_{player.player_id}"
-        st.session_state[exp_key] = float(
-            player.expected_minutes
-        )  # <— ensures control shows the updated value
-
-        st.session_state["render_nonce"] = st.session_state.get("render_nonce", 0) + 1
-
-        # Buttons — handle first, and return immediately to avoid double-click feel
+        current_ends = list(_ensure_ends_cache(player))
+        # (Re)seed the inputs whenever the cached ends moved since they were last
+        # seeded (e.g. Expected Minutes or the archetype changed), or their state is
+        # gone: Streamlit drops a widget's value on any run that doesn't render it
+        if (
+            st.session_state.get(f"end_seed_{player.player_id}") != current_ends
+            or f"end_{player.player_id}_0" not in st.session_state
+        ):
+            _seed_end_inputs(player.player_id, current_ends)
+
+        # Horizontal inputs: exactly L-1 columns (t1..t{L-1}), batched in a form so
+        # stepping a value doesn't rerun the row; edits commit together on Apply
+        with st.form(f"ends_form_{player.player_id}", border=False):
+            cols = st.columns([1] * (L - 1), gap="small")
+            for i in range(L - 1):
+                remaining = (L - 1) - (i + 1)
+                with cols[i]:
+                    st.caption(f"t{i + 1}")
+                    st.number_input(
+                        f"End Time {i + 1}",
+                        min_value=float((i + 1) * END_MIN_GAP),
+                        max_value=float(48.0 - remaining * END_MIN_GAP),
+                        step=0.5,
+                        key=f"end_{player.player_id}_{i}",
+                        label_visibility="collapsed",
+                    )
+            st.form_submit_button("Apply", on_click=_apply_ends, args=(player, L))
+
+        # The header and on-court chart live outside this fragment
+        if st.session_state.pop(f"ends_applied_{player.player_id}", False):
+            st.rerun(scope="app")
+
+        # Close only leaves edit mode (the stints were committed on Apply): its on_click
+        # runs before the click's rerun, so that one row rerun redraws it closed
         c1, _ = st.columns([1, 8])
         with c1:
-            if st.button("Close", key=f"close_{player.player_id}"):
-                _sync_ends_from_current(player)  # keep ends cached to match the plot
-                st.session_state[f"editing_{player.player_id}"] = False
-                # sync Expected Minutes widget so it doesn't snap back
-                exp_key = f"exp_{player.player_id}"
-                st.session_state[exp_key] = float(player.expected_minutes)
-                st.session_state["render_nonce"] = (
-                    st.session_state.get("render_nonce", 0) + 1
-                )
-                st.rerun()
-
-                st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
+            st.button(
+                "Close",
+                key=f"close_{player.player_id}",
+                on_click=_close_editor,
+                args=(player,),
+            )
 
     # 2) Controls (RIGHT) — render first so widget updates apply *before* we draw the timeline
-    with ctrl_col:
-        cfg = get_config()
-        arch_ids = ["NotSet"] + list(cfg.archetypes.keys())
-        current = player.archetype_id or "NotSet"
-
-        c_arch, c_exp, c_cw, c_sd, c_btn = st.columns(CTRL_COL_SPECS, gap="small")
-
-        k_arch_prev, k_exp_prev, k_ends = _prev_keys(player.player_id)
-        # ensure defaults exist before we read them
-        st.session_state.setdefault(k_arch_prev, current)
-        st.session_state.setdefault(k_exp_prev, float(player.expected_minutes))
-        prev_arch = st.session_state[k_arch_prev]
-        prev_exp = st.session_state[k_exp_prev]
-
-        with c_arch:
-            new_arch = st.selectbox(
-                "Archetype",
-                arch_ids,
-                index=arch_ids.index(current) if current in arch_ids else 0,
-                key=f"arch_{player.player_id}",
-                label_visibility="collapsed",
-            )
-            player.archetype_id = None if new_arch == "NotSet" else new_arch
-
-        with c_exp:
-            exp_key = f"exp_{player.player_id}"
-            if exp_key not in st.session_state:
-                st.session_state[exp_key] = float(player.expected_minutes)
-            new_exp = st.number_input(
-                "Expected Minutes",
-                min_value=0.0,
-                max_value=48.0,
-                step=0.5,
-                key=exp_key,
-                label_visibility="collapsed",
-            )
-            player.expected_minutes = float(new_exp)
-
-        with c_cw:
-            player.closer_weighting = st.number_input(
-                "Closer Weighting",
-                min_value=0.0,
-                max_value=1.0,
-                step=0.01,
-                value=float(player.closer_weighting),
-                key=f"cw_{player.player_id}",
-                label_visibility="collapsed",
-            )
+    arch_ids = ["NotSet"] + list(cfg.archetypes.keys())
+    current = player.archetype_id or "NotSet"
+
+    k_arch_prev, k_exp_prev, k_ends = _prev_keys(player.player_id)
+    # ensure defaults exist before we read them
+    st.session_state.setdefault(k_arch_prev, current)
+    st.session_state.setdefault(k_exp_prev, float(player.expected_minutes))
+    prev_arch = st.session_state[k_arch_prev]
+    prev_exp = st.session_state[k_exp_prev]
+
+    with c_arch:
+        new_arch = st.selectbox(
+            "Archetype",
+            arch_ids,
+            index=arch_ids.index(current) if current in arch_ids else 0,
+            key=f"arch_{player.player_id}",
+            label_visibility="collapsed",
+        )
+        player.archetype_id = None if new_arch == "NotSet" else new_arch
 
-        with c_sd:
-            player.stddev_scaler = st.number_input(
-                "Std Dev Scaler",
-                min_value=0.0,
-                step=0.1,
-                value=float(player.stddev_scaler),
-                key=f"sd_{player.player_id}",
-                label_visibility="collapsed",
-            )
+    with c_exp:
+        exp_key = f"exp_{player.player_id}"
+        if exp_key not in st.session_state:
+            st.session_state[exp_key] = float(player.expected_minutes)
+        new_exp = st.number_input(
+            "Expected Minutes",
+            min_value=0.0,
+            max_value=48.0,
+            step=0.5,
+            key=exp_key,
+            label_visibility="collapsed",
+        )
+        player.expected_minutes = float(new_exp)
+
+    with c_cw:
+        prev_cw = float(player.closer_weighting)
+        player.closer_weighting = st.number_input(
+            "Closer Weighting",
+            min_value=0.0,
+            max_value=1.0,
+            step=0.01,
+            value=float(player.closer_weighting),
+            key=f"cw_{player.player_id}",
+            label_visibility="collapsed",
+        )
 
-        with c_btn:
-            if st.button("Edit", key=f"edit_{player.player_id}", width="stretch"):
-                st.session_state[f"editing_{player.player_id}"] = True
-                # ensure ends are in sync when opening editor
-                _sync_ends_from_current(player)
-                st.session_state["render_nonce"] = (
-                    st.session_state.get("render_nonce", 0) + 1
-                )
-                st.rerun()
+    with c_sd:
+        player.stddev_scaler = st.number_input(
+            "Std Dev Scaler",
+            min_value=0.0,
+            step=0.1,
+            value=float(player.stddev_scaler),
+            key=f"sd_{player.player_id}",
+            label_visibility="collapsed",
+        )
+
+    with c_btn:
+        # on_click runs before the rerun the click triggers, so the editor (drawn
+        # above these controls) shows in that same pass without an extra st.rerun()
+        st.button(
+            "Edit",
+            key=f"edit_{player.player_id}",
+            width="stretch",
+            on_click=_open_editor,
+            args=(player,),
+        )
 
     # if arch/exp changed, recompute ends so plot/editor stay aligned
     changed_arch = (player.archetype_id or "NotSet") != (prev_arch or "NotSet")
     changed_exp = float(player.expected_minutes) != float(prev_exp)
+    changed_cw = float(player.closer_weighting) != prev_cw
 
     if changed_arch:
         # Wipe any prior stint info so new archetype uses its default shape
         player.stints_raw = []  # empty triggers equal shares per on/off group via _ensure_default_percentages
         # Reset editor cache to match the new archetype
-        _sync_ends_from_current(player)
-        ends_key = f"ends_{player.player_id}"
-        st.session_state[ends_key] = compute_default_boundaries(player)
-        # Bump render key and store "prev" for next pass
-        st.session_state["render_nonce"] = st.session_state.get("render_nonce", 0) + 1
+        _ensure_ends_cache(player)
+        # Store "prev" for next pass
         st.session_state[k_arch_prev] = player.archetype_id or "NotSet"
         st.session_state[k_exp_prev] = float(player.expected_minutes)
 
     elif changed_exp:
         # Same archetype, minutes changed → recompute ends to match new total
-        _sync_ends_from_current(player)
-        st.session_state["render_nonce"] = st.session_state.get("render_nonce", 0) + 1
+        _ensure_ends_cache(player)
         st.session_state[k_arch_prev] = player.archetype_id or "NotSet"
         st.session_state[k_exp_prev] = float(player.expected_minutes)
 
+    # Team-level outputs live outside this fragment (stints editor edits reach them
+    # on Apply, which reruns the app itself)
+    if changed_arch or changed_exp or changed_cw:
+        st.rerun(scope="app")
+
     # 3) Timeline (MIDDLE) — render AFTER controls so it reflects latest values in the same rerun
     with tl_col:
-        _timeline(player)
+        _timeline(player, cfg)
 
 
 def render_team_panel(team: Team):
@@ -346,34 +472,39 @@ def render_team_panel(team: Team):
     header_ph = st.container()
 
     # Split players while keeping original relative order (stable)
-    starters = [p for p in team.players if _is_starter_like(p)]
-    bench = [p for p in team.players if not _is_starter_like(p)]
+    cfg = get_config()
+    starters, bench = [], []
+    for p in team.players:
+        (starters if _is_starter_like(p, cfg) else bench).append(p)
 
     _controls_header_row()
 
     if starters:
         st.caption("Starters")
         for p in starters:
-            _player_row(p)
+            _player_row(p, cfg)
 
     if bench:
         st.caption("Bench")
         for p in bench:
-            _player_row(p)
+            _player_row(p, cfg)
 
     # Now show the header with the fresh closer total (appears at top via placeholder)
     with header_ph:
         _team_header(team)
 
 
-def render_oncourt_chart(team: Team):
-    xs, ys = team_oncourt_steps(team)
+@st.cache_data(max_entries=8, show_spinner=False)
+def _team_steps(sig: tuple):
+    """On-court step series for a (archetype_id, expected_minutes, stints_raw) signature."""
+    return oncourt_steps_for(sig)
+
 
-    # Dynamic key that changes whenever players' rotations change
-    nonce = st.session_state.get("render_nonce", 0)
-    # simple signature: team name + number of points + last value
-    sig = f"{team.name}_{len(xs)}_{ys[-1] if ys else 0}_{nonce}"
+def _oncourt_yrange(ys: List[int]) -> List[int]:
+    return [0, max(6, max(ys) + 1 if ys else 6)]
 
+
+def _build_oncourt_fig(xs: List[float], ys: List[int]) -> go.Figure:
     fig = go.Figure()
 
     # main step line (right-constant)
@@ -405,10 +536,37 @@ def render_oncourt_chart(team: Team):
         fixedrange=True,
     )
     fig.update_yaxes(
-        range=[0, max(6, max(ys) + 1 if ys else 6)],
+        range=_oncourt_yrange(ys),
         dtick=1,
         showgrid=True,
         fixedrange=True,
     )
+    return fig
+
+
+def render_oncourt_chart(team: Team):
+    # Only chart-relevant inputs, order-independent so identical rosters share a cache entry
+    sig = tuple(
+        sorted(
+            (p.archetype_id, float(p.expected_minutes), tuple(p.stints_raw))
+            for p in team.players
+            if p.archetype_id
+        )
+    )
+    xs, ys = _team_steps(sig)
+
+    # Content key: stays stable (and the chart keeps its DOM) while the rotation is unchanged
+    sig = f"{team.name}_{_sig_floats([*xs, *ys])}"
+
+    # Build the figure once per team, then only patch its data when the rotation changes
+    fig_key, sig_key = f"oncourt_fig_{team.name}", f"oncourt_sig_{team.name}"
+    fig = st.session_state.get(fig_key)
+    if fig is None:
+        fig = _build_oncourt_fig(xs, ys)
+        st.session_state[fig_key] = fig
+    elif st.session_state.get(sig_key) != sig:
+        fig.update_traces(x=xs, y=ys)
+        fig.update_yaxes(range=_oncourt_yrange(ys))
+    _set_if_changed(sig_key, sig)
 
     st.plotly_chart(fig, width="stretch", key=f"oncourt_{sig}")
@@ -1,8 +1,12 @@
 # run_app.py
+import compileall
 import os
+import socket
+import subprocess
 import sys
 import threading
 import time
+import urllib.parse
 import urllib.request
 import webbrowser
 from pathlib import Path
@@ -16,15 +20,27 @@ def resource_path(*parts):
 def open_when_ready(url, timeout=10):
     def worker():
         start = time.time()
+        parsed = urllib.parse.urlsplit(url)
+        addr = (parsed.hostname, parsed.port or 80)
         health = url.rstrip("/") + "/_stcore/health"
+        delay = 0.05
         while time.time() - start < timeout:
+            # Cheap TCP probe first; only hit the health endpoint once the port accepts
             try:
-                with urllib.request.urlopen(health, timeout=1) as r:
+                socket.create_connection(addr, timeout=0.1).close()
+            except OSError:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.2)
+                continue
+            try:
+                with urllib.request.urlopen(health, timeout=0.5) as r:
                     if r.status == 200:
                         webbrowser.open(url, new=1, autoraise=True)
                         return
             except Exception:
-                time.sleep(0.25)
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
 
     threading.Thread(target=worker, daemon=True).start()
 
@@ -43,11 +59,7 @@ def main():
     url = "http://127.0.0.1:8501"
     open_when_ready(url)
 
-    # Import CLI only after env is set
-    from streamlit.web.cli import main as stcli
-
-    sys.argv = [
-        "streamlit",
+    args = [
         "run",
         app_path,
         "--global.developmentMode=false",  # belt & braces
@@ -58,7 +70,29 @@ def main():
         "--server.port",
         "8501",
     ]
-    stcli()
+
+    if getattr(sys, "frozen", False):
+        # PyInstaller build: there is no separate interpreter to spawn, run the CLI in-process
+        # Import CLI only after env is set
+        from streamlit.web.cli import main as stcli
+
+        sys.argv = ["streamlit", *args]
+        stcli()
+        return
+
+    # Source checkout: byte-compile the modules app.py imports up front (optimized,
+    # matching -O below; Streamlit execs app.py itself from source), then serve from a
+    # child interpreter while this one only waits on it
+    os.environ.pop("PYTHONDONTWRITEBYTECODE", None)
+    compileall.compile_dir(resource_path("rotation_tool"), quiet=1, optimize=1)
+    proc = subprocess.Popen(
+        [sys.executable, "-O", "-m", "streamlit", *args], env=os.environ.copy()
+    )
+    try:
+        sys.exit(proc.wait())
+    except KeyboardInterrupt:
+        proc.terminate()
+        sys.exit(proc.wait())
 
 
 if __name__ == "__main__":